@@ -17,7 +17,7 @@ from src.platforms import Platform, get_command, get_tool_output
 
 def main():
     try:
-        input_data = json.load(sys.stdin)
+        input_data = json.loads(sys.stdin.buffer.read())
     except (json.JSONDecodeError, ValueError):
         sys.exit(0)
 
@@ -11,6 +11,7 @@ import os
 import re
 import shlex
 import sys
+import warnings
 
 # Ensure the extension root is importable (scripts/ -> plugin root)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -33,9 +34,9 @@ else:
     _log.addHandler(logging.NullHandler())
 
 
-# Build patterns from processor registry (auto-discovered)
+# Build patterns from processor registry (auto-discovered, cached on disk)
 def _load_compressible_patterns() -> list[str]:
-    """Import hook_patterns from the processor registry."""
+    """Load hook_patterns from the processor registry's pattern cache."""
     # Add extension root to path so we can import the src package
     _this_dir = os.path.dirname(os.path.abspath(__file__))
     _extension_root = os.path.dirname(_this_dir)
@@ -44,7 +45,7 @@ def _load_compressible_patterns() -> list[str]:
         sys.path.insert(0, _extension_root)
     from src.processors import collect_hook_patterns  # noqa: PLC0415
 
-    patterns = collect_hook_patterns()
+    patterns = collect_hook_patterns(use_cache=True)
     _log.debug("Loaded %d compressible patterns", len(patterns))
     return patterns
 
@@ -54,7 +55,44 @@ try:
 except Exception:
     _log.exception("Failed to load compressible patterns")
     raise
-COMPILED_PATTERNS = [re.compile(p) for p in COMPRESSIBLE_PATTERNS]
+
+
+# Only the combined alternations below are compiled at import time.  The hook
+# runs as a fresh process per command and compiled regexes cannot be persisted
+# across processes, so individual patterns are compiled on demand (through
+# re's own cache) by the fallback path and explain_decision() only.
+def _compile_any(patterns: list[str]) -> re.Pattern[str] | None:
+    """Combine ``patterns`` into one alternation so a single search tests them all.
+
+    Returns None if they cannot be combined (e.g. a user processor pattern
+    with a global inline flag such as ``(?i)``); callers then fall back to
+    searching the patterns one by one.  Python 3.11+ rejects a global flag
+    inside the alternation, while 3.10 only warns and applies it to every
+    branch, so the warning and any flags left on the result count as failure.
+    """
+    if not patterns:
+        return re.compile(r"(?!)")  # matches nothing, like an empty any()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            combined = re.compile("|".join(f"(?:{p})" for p in patterns))
+    except (re.error, DeprecationWarning):
+        return None
+    # Every pattern is wrapped in a group, so a global flag can only have come
+    # from inside one of them (e.g. served from re's cache without a warning).
+    if combined.flags & ~re.UNICODE:
+        return None
+    return combined
+
+
+def _search_any(combined: re.Pattern[str] | None, patterns: list[str], *texts: str) -> bool:
+    """Return True if any pattern matches any of ``texts``."""
+    if combined is not None:
+        return any(combined.search(t) for t in texts)
+    return any(re.search(p, t) for p in patterns for t in texts)
+
+
+_COMPRESSIBLE_ANY = _compile_any(COMPRESSIBLE_PATTERNS)
 
 # Trailing pipe suffixes that are safe to wrap.
 # These are stripped before checking exclusions so commands like
@@ -121,7 +159,7 @@ EXCLUDED_PATTERNS = [
     *_STREAMING_EXCLUDED_PATTERNS,
 ]
 
-COMPILED_EXCLUDED = [re.compile(p) for p in EXCLUDED_PATTERNS]
+_EXCLUDED_ANY = _compile_any(EXCLUDED_PATTERNS)
 
 # Strip leading path prefix so '/usr/bin/git status' → 'git status',
 # './node_modules/.bin/jest' → 'jest', '.venv/bin/pip' → 'pip', etc.
@@ -222,7 +260,7 @@ _SEGMENT_EXCLUDED_PATTERNS = [
     *_STREAMING_EXCLUDED_PATTERNS,
 ]
 
-_COMPILED_SEGMENT_EXCLUDED = [re.compile(p) for p in _SEGMENT_EXCLUDED_PATTERNS]
+_SEGMENT_EXCLUDED_ANY = _compile_any(_SEGMENT_EXCLUDED_PATTERNS)
 
 
 def _is_segment_safe(segment: str) -> bool:
@@ -234,10 +272,7 @@ def _is_segment_safe(segment: str) -> bool:
     if _has_output_redirection(segment):
         return False
     norm = _normalize_cmd(segment)
-    for pattern in _COMPILED_SEGMENT_EXCLUDED:
-        if pattern.search(segment) or pattern.search(norm):
-            return False
-    return True
+    return not _search_any(_SEGMENT_EXCLUDED_ANY, _SEGMENT_EXCLUDED_PATTERNS, segment, norm)
 
 
 def _is_chain_compressible(command: str) -> bool:
@@ -260,10 +295,7 @@ def _is_chain_compressible(command: str) -> bool:
         if not _is_segment_safe(check_seg):
             return False
         norm_seg = _normalize_cmd(check_seg)
-        is_comp = any(p.search(check_seg) for p in COMPILED_PATTERNS) or any(
-            p.search(norm_seg) for p in COMPILED_PATTERNS
-        )
-        if is_comp:
+        if _search_any(_COMPRESSIBLE_ANY, COMPRESSIBLE_PATTERNS, check_seg, norm_seg):
             has_compressible = True
 
     return has_compressible
@@ -307,18 +339,15 @@ def is_compressible(command: str) -> bool:
     # Check exclusions against both raw and path-stripped forms, so
     # path-prefixed launchers (/usr/bin/vim, ./python) are still caught.
     norm_cmd = _normalize_cmd(check_cmd)
-    for pattern in COMPILED_EXCLUDED:
-        if pattern.search(check_cmd) or pattern.search(norm_cmd):
-            return False
-    return any(pattern.search(check_cmd) for pattern in COMPILED_PATTERNS) or any(
-        pattern.search(norm_cmd) for pattern in COMPILED_PATTERNS
-    )
+    if _search_any(_EXCLUDED_ANY, EXCLUDED_PATTERNS, check_cmd, norm_cmd):
+        return False
+    return _search_any(_COMPRESSIBLE_ANY, COMPRESSIBLE_PATTERNS, check_cmd, norm_cmd)
 
 
 def _matched_exclusion(check_cmd: str, norm_cmd: str) -> str | None:
     """Return the source regex of the first exclusion that matches, if any."""
-    for src, pattern in zip(EXCLUDED_PATTERNS, COMPILED_EXCLUDED, strict=False):
-        if pattern.search(check_cmd) or pattern.search(norm_cmd):
+    for src in EXCLUDED_PATTERNS:
+        if re.search(src, check_cmd) or re.search(src, norm_cmd):
             return src
     return None
 
@@ -326,8 +355,8 @@ def _matched_exclusion(check_cmd: str, norm_cmd: str) -> str | None:
 def _matched_compressible(check_cmd: str, norm_cmd: str) -> list[str]:
     """Return source regexes of all compressible patterns that match."""
     matched = []
-    for src, pattern in zip(COMPRESSIBLE_PATTERNS, COMPILED_PATTERNS, strict=False):
-        if pattern.search(check_cmd) or pattern.search(norm_cmd):
+    for src in COMPRESSIBLE_PATTERNS:
+        if re.search(src, check_cmd) or re.search(src, norm_cmd):
             matched.append(src)
     return matched
 
@@ -408,8 +437,10 @@ def explain_decision(command: str) -> dict:
 
 def main():
     try:
-        raw_input = sys.stdin.read()
-        _log.debug("stdin: %s", raw_input[:500])
+        # Read raw bytes: json.loads detects the UTF encoding itself, so the
+        # text-mode decode (locale-dependent on Windows) is skipped.
+        raw_input = sys.stdin.buffer.read()
+        _log.debug("stdin: %r", raw_input[:500])
         input_data = json.loads(raw_input)
     except (json.JSONDecodeError, ValueError) as exc:
         _log.debug("Invalid JSON input: %s", exc)
@@ -22,7 +22,6 @@ import re
 import signal
 import subprocess
 import sys
-import uuid
 
 # Ensure the extension root is importable (scripts/ -> plugin root)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -238,7 +237,7 @@ def main():
     engine = CompressionEngine()
 
     if is_chain:
-        marker_prefix = MARKER_PREFIX_TEMPLATE.format(uuid.uuid4().hex[:12])
+        marker_prefix = MARKER_PREFIX_TEMPLATE.format(os.urandom(6).hex())
         rewritten = inject_markers(chain_parts, marker_prefix)
         _log.debug("Chain rewrite: %r", rewritten)
 
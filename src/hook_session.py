@@ -37,7 +37,7 @@ def main():
     # Read Claude Code's session_id from stdin JSON payload
     cc_session = None
     try:
-        raw = sys.stdin.read()
+        raw = sys.stdin.buffer.read()
         if raw.strip():
             data = json.loads(raw)
             cc_session = data.get("session_id")
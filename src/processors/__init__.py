@@ -1,18 +1,18 @@
 """Processor auto-discovery registry.
 
 Scans all .py modules in this package, finds non-abstract Processor
-subclasses, instantiates them, and returns them sorted by priority.
+subclasses, and returns them (or instances of them) sorted by priority.
 
 Also loads user-defined processors from ~/.token-saver/processors/ (or
 a custom directory set via the ``user_processors_dir`` config key).
 """
 
+import contextlib
 import importlib
-import importlib.util
-import inspect
+import json
 import os
-import pkgutil
 import sys
+from collections import deque
 
 from .base import Processor
 
@@ -27,6 +27,8 @@ def _load_user_processors(user_dir: str) -> None:
     if not os.path.isdir(user_dir):
         return
 
+    import importlib.util  # noqa: PLC0415
+
     for filename in sorted(os.listdir(user_dir)):
         if not filename.endswith(".py") or filename.startswith("_"):
             continue
@@ -62,12 +64,16 @@ def _get_user_processors_dir() -> str:
     return os.path.join(data_dir(), "processors")
 
 
-def discover_processors() -> list[Processor]:
-    """Auto-discover all Processor subclasses in this package.
+def discover_processor_classes() -> list[type[Processor]]:
+    """Import all processor modules and return the non-abstract Processor subclasses.
 
-    Returns instantiated processors sorted by priority (lowest first).
-    GenericProcessor (priority 999) is always last.
+    Classes are not instantiated, for callers that only need class-level
+    attributes (``priority``, ``hook_patterns``).  Ordered by priority.
     """
+    # Imported here so a hook-pattern cache hit never pays for them.
+    import inspect  # noqa: PLC0415
+    import pkgutil  # noqa: PLC0415
+
     package_path = __path__
     package_name = __name__
 
@@ -81,20 +87,45 @@ def discover_processors() -> list[Processor]:
     user_dir = _get_user_processors_dir()
     _load_user_processors(user_dir)
 
-    # Find all non-abstract Processor subclasses
-    def _all_subclasses(cls):
-        result = set()
-        for sub in cls.__subclasses__():
-            if not inspect.isabstract(sub):
-                result.add(sub)
-            result.update(_all_subclasses(sub))
-        return result
-
-    subclasses = _all_subclasses(Processor)
-    instances = [cls() for cls in subclasses]
-    # Sort by (priority, name): _all_subclasses returns a set, so equal
-    # priorities would otherwise order nondeterministically across runs,
-    # making first-match routing unstable.
+    # Find all non-abstract Processor subclasses (breadth-first)
+    found: list[type[Processor]] = []
+    visited: set[type[Processor]] = set()
+    queue = deque(Processor.__subclasses__())
+    while queue:
+        cls = queue.popleft()
+        if cls in visited:
+            continue
+        visited.add(cls)
+        if not inspect.isabstract(cls):
+            found.append(cls)
+        queue.extend(cls.__subclasses__())
+
+    return sorted(found, key=lambda c: (c.priority, c.__module__, c.__qualname__))
+
+
+# Memoized discover_processors() result, keyed by the classes it was built from.
+_DISCOVERED: list[Processor] | None = None
+_DISCOVERED_CLASSES: tuple[type[Processor], ...] = ()
+
+
+def discover_processors() -> list[Processor]:
+    """Auto-discover all Processor subclasses in this package.
+
+    Returns instantiated processors sorted by priority (lowest first).
+    GenericProcessor (priority 999) is always last.
+
+    Instances are memoized and reused while the set of discovered classes
+    is unchanged; loading a new user processor rebuilds them.
+    """
+    global _DISCOVERED, _DISCOVERED_CLASSES
+
+    classes = tuple(discover_processor_classes())
+    if _DISCOVERED is not None and classes == _DISCOVERED_CLASSES:
+        return list(_DISCOVERED)
+
+    instances = [cls() for cls in classes]
+    # Sort by (priority, name) so equal priorities route deterministically
+    # by processor name rather than by class location.
     instances.sort(key=lambda p: (p.priority, p.name))
 
     # Validate: GenericProcessor must be last
@@ -104,21 +135,99 @@ def discover_processors() -> list[Processor]:
             f"but last processor is {instances[-1].name!r} with priority {instances[-1].priority}"
         )
 
-    return instances
+    _DISCOVERED, _DISCOVERED_CLASSES = instances, classes
+    return list(instances)
+
+
+def _processor_name(cls: type[Processor]) -> str:
+    """Return the ``name`` of a processor class without running its constructor.
+
+    ``name`` is a property that returns a constant in practice, so it is
+    read from a bare instance; constructors (which may build helper
+    processors) only run if the property fails without instance state.
+    """
+    try:
+        return object.__new__(cls).name
+    except Exception:
+        return cls().name
+
+
+def _processor_patterns() -> list[list]:
+    """Return ``[name, hook_patterns]`` per processor class, in priority order."""
+    return [[_processor_name(cls), list(cls.hook_patterns)] for cls in discover_processor_classes()]
+
 
+_HOOK_PATTERNS_CACHE = "hook_patterns.json"
+
+
+def _py_file_stats(directory: str) -> list[list]:
+    """Return ``[path, mtime_ns, size]`` for each .py file in ``directory``."""
+    try:
+        with os.scandir(directory) as it:
+            return [
+                [entry.path, entry.stat().st_mtime_ns, entry.stat().st_size]
+                for entry in it
+                if entry.name.endswith(".py")
+            ]
+    except OSError:
+        return []
+
+
+def _sources_fingerprint(user_dir: str) -> list[list]:
+    """Fingerprint every built-in and user processor source file."""
+    builtin_dir = os.path.dirname(os.path.abspath(__file__))
+    return sorted(_py_file_stats(builtin_dir) + _py_file_stats(user_dir))
+
+
+def _cached_processor_patterns() -> list[list]:
+    """Return ``[name, hook_patterns]`` per processor, served from a JSON cache.
+
+    The PreToolUse hook runs as a fresh process for every Bash command, and
+    discovery imports every processor module just to read class attributes.
+    The cache in the data dir is keyed on the mtime and size of all processor
+    source files (built-in and user), so editing, adding or upgrading a
+    processor rebuilds it on the next call.
+    """
+    from .. import data_dir  # noqa: PLC0415
 
-def collect_hook_patterns() -> list[str]:
+    fingerprint = _sources_fingerprint(_get_user_processors_dir())
+    cache_path = os.path.join(data_dir(), _HOOK_PATTERNS_CACHE)
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+        if cached["fingerprint"] == fingerprint:
+            cached_entries: list[list] = cached["processors"]
+            return cached_entries
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    entries = _processor_patterns()
+    # Best-effort write; replace atomically so a concurrent hook never reads
+    # a half-written file.
+    with contextlib.suppress(OSError):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"fingerprint": fingerprint, "processors": entries}, f)
+        os.replace(tmp_path, cache_path)
+    return entries
+
+
+def collect_hook_patterns(use_cache: bool = False) -> list[str]:
     """Collect all hook_patterns from discovered processors.
 
     Returns a flat list of regex pattern strings, used by hook_pretool.py.
     Disabled processors are excluded so their commands are not intercepted.
+    With ``use_cache``, patterns come from the on-disk cache (see
+    ``_cached_processor_patterns``) instead of importing every processor.
     """
     from .. import config  # noqa: PLC0415
 
     raw_disabled = config.get("disabled_processors") or []
     disabled = set(raw_disabled if isinstance(raw_disabled, list) else [])
+    entries = _cached_processor_patterns() if use_cache else _processor_patterns()
     patterns: list[str] = []
-    for processor in discover_processors():
-        if processor.name not in disabled:
-            patterns.extend(processor.hook_patterns)
+    for name, hook_patterns in entries:
+        if name not in disabled:
+            patterns.extend(hook_patterns)
     return patterns
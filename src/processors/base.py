@@ -1,6 +1,8 @@
 """Abstract base class for output processors."""
 
+import re
 from abc import ABC, abstractmethod
+from typing import ClassVar
 
 # Matches any Python invocation: python, python3, python3.11,
 # .venv/bin/python3, /usr/bin/python, etc.
@@ -19,15 +21,41 @@ class Processor(ABC):
         30-49  Specialized (network, docker, kubectl, terraform, env, search, system_info)
         50-69  Content-based (file_listing, file_content)
         999    Generic fallback (must always be last)
+
+    Processors whose ``can_handle`` is a single regex search can set
+    ``handle_pattern`` instead of overriding it; the pattern is compiled once
+    per class.  Unlike ``hook_patterns`` it is matched against the full
+    command the engine sees, so it is usually not anchored to the start.
+    ``handle_keywords`` optionally lists literals of which every match of
+    ``handle_pattern`` contains at least one; commands containing none of
+    them are rejected without running the regex.
     """
 
     priority: int = 50
     hook_patterns: list[str] = []
+    handle_pattern: str | None = None
+    handle_keywords: tuple[str, ...] = ()
     chain_to: str | list[str] | None = None
 
-    @abstractmethod
+    _handle_re: ClassVar[re.Pattern[str]] = re.compile(r"(?!)")
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if "handle_pattern" in cls.__dict__ and cls.handle_pattern is not None:
+            cls._handle_re = re.compile(cls.handle_pattern)
+
     def can_handle(self, command: str) -> bool:
-        """Return True if this processor can handle the given command."""
+        """Return True if this processor can handle the given command.
+
+        Default: search ``handle_pattern``.  Override for anything more involved.
+        """
+        if self.handle_keywords:
+            for keyword in self.handle_keywords:
+                if keyword in command:
+                    break
+            else:
+                return False
+        return bool(self._handle_re.search(command))
 
     @abstractmethod
     def process(self, command: str, output: str) -> str:
@@ -7,14 +7,17 @@ from .base import Processor
 
 ANSI_RE = re.compile(r"\x1b\[[0-9;]*[a-zA-Z]|\x1b\].*?\x07")
 
-# Regex to normalize numbers/percentages for fuzzy matching
-_NUMERIC_RE = re.compile(r"\d+(\.\d+)?")
 # Unicode block/box characters are unambiguous progress bars.
 _PROGRESS_BLOCK_RE = re.compile(r"[━█▓░▒■□●○]{3,}")
 # ASCII runs (####, ====, ---->) are only progress bars in progress context;
 # on their own they are usually separators / rules that must be preserved.
 _ASCII_BAR_RE = re.compile(r"[#=\->]{5,}")
 _PROGRESS_CONTEXT_RE = re.compile(r"[%\[\]]|\b\d+/\d+\b|ETA|eta|\d+(\.\d+)?\s*[KMGT]?i?B/s")
+# Braille spinner frames that appear alone on a line
+_SPINNER_GLYPHS = frozenset("⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏⣾⣽⣻⢿⡿⣟⣯⣷")
+# Deletes ASCII digits.  Used to count digits (length difference) and to
+# normalize lines for fuzzy matching, both in C instead of Python loops.
+_DIGIT_KILLER = str.maketrans("", "", "0123456789")
 
 
 class GenericProcessor(Processor):
@@ -31,13 +34,13 @@ class GenericProcessor(Processor):
         return True  # Always matches as fallback
 
     def process(self, command: str, output: str) -> str:
-        lines = output.splitlines()
-        lines = self._strip_ansi(lines)
-        lines = self._strip_progress_bars(lines)
-        lines = self._collapse_blank_lines(lines)
-        lines = self._collapse_repeated_lines(lines)
-        lines = self._collapse_similar_lines(lines)
-        lines = self._strip_trailing_whitespace(lines)
+        # One substitution over the whole buffer instead of one per line
+        text = ANSI_RE.sub("", output)
+        # Similar-line collapsing only groups lines that differ in numbers
+        # and carry a numeric progress signal; digit-free output (typical for
+        # git, lint, listings) can skip it entirely.
+        has_digits = any(d in text for d in "0123456789")
+        lines = self._compress_lines(text.splitlines(), collapse_similar=has_digits)
         threshold = config.get("generic_truncate_threshold")
         if len(lines) > threshold:
             lines = self._truncate_middle(lines)
@@ -49,126 +52,103 @@ class GenericProcessor(Processor):
         Used by the engine after a specialized processor to sanitize output
         without applying heavy dedup or truncation.
         """
-        lines = text.splitlines()
-        lines = self._strip_ansi(lines)
-        lines = self._collapse_blank_lines(lines)
-        lines = self._strip_trailing_whitespace(lines)
-        return "\n".join(lines)
-
-    def _strip_ansi(self, lines: list[str]) -> list[str]:
-        return [ANSI_RE.sub("", line) for line in lines]
-
-    def _strip_trailing_whitespace(self, lines: list[str]) -> list[str]:
-        return [line.rstrip() for line in lines]
-
-    def _strip_progress_bars(self, lines: list[str]) -> list[str]:
-        """Remove lines that are purely progress bars or spinners."""
-        result = []
-        for line in lines:
-            stripped = line.strip()
-            # Unicode block bars: always progress noise.
-            block = _PROGRESS_BLOCK_RE.search(stripped) if stripped else None
-            if block and len(block.group(0)) > len(stripped) * 0.5:
-                continue
-            # ASCII bars (====, ####, ---->): only strip when accompanied by a
-            # progress signal (%, [..], n/m, rate, ETA).  A bare "--------" or
-            # "========" line is a separator/rule and must survive.
-            ascii_bar = _ASCII_BAR_RE.search(stripped) if stripped else None
-            if (
-                ascii_bar
-                and len(ascii_bar.group(0)) > len(stripped) * 0.5
-                and _PROGRESS_CONTEXT_RE.search(stripped)
-            ):
-                continue
-            # Spinner lines
-            if stripped in (
-                "⠋",
-                "⠙",
-                "⠹",
-                "⠸",
-                "⠼",
-                "⠴",
-                "⠦",
-                "⠧",
-                "⠇",
-                "⠏",
-                "⣾",
-                "⣽",
-                "⣻",
-                "⢿",
-                "⡿",
-                "⣟",
-                "⣯",
-                "⣷",
-            ):
-                continue
-            result.append(line)
-        return result
-
-    def _collapse_blank_lines(self, lines: list[str]) -> list[str]:
-        """Merge consecutive blank lines into one."""
-        result = []
+        result: list[str] = []
         prev_blank = False
-        for line in lines:
-            is_blank = line.strip() == ""
+        for line in ANSI_RE.sub("", text).splitlines():
+            stripped = line.rstrip()
+            # Merge consecutive blank lines into one
+            is_blank = not stripped
             if is_blank and prev_blank:
                 continue
-            result.append(line)
+            result.append(stripped)
             prev_blank = is_blank
-        return result
-
-    def _collapse_repeated_lines(self, lines: list[str]) -> list[str]:
-        """Collapse consecutive identical lines into `line (xN)`."""
-        if not lines:
-            return lines
-        result: list[str] = []
-        current = lines[0]
-        count = 1
-        for line in lines[1:]:
-            if line == current and current.strip():
-                count += 1
-            else:
-                self._flush(result, current, count)
-                current = line
-                count = 1
-        self._flush(result, current, count)
-        return result
+        return "\n".join(result)
 
-    def _collapse_similar_lines(self, lines: list[str]) -> list[str]:
-        """Collapse consecutive lines that differ only in numbers/percentages.
+    def _compress_lines(self, lines: list[str], collapse_similar: bool = True) -> list[str]:
+        """Apply every line-level heuristic in a single pass.
 
-        Only applies to lines where >=30% of the content is numeric — this
-        targets progress output (curl, wget, download bars) while preserving
-        data lines where numbers are meaningful identifiers.
+        Equivalent to running, in order: progress bar stripping, blank line
+        collapsing, identical line collapsing (``line (xN)``), similar line
+        collapsing (unless ``collapse_similar`` is False) and trailing
+        whitespace stripping.  Each stage hands its output directly to the
+        next one instead of building a new list.
         """
-        if not lines:
-            return lines
         result: list[str] = []
-        current = lines[0]
-        current_normalized = self._normalize_numbers(current)
-        group: list[str] = [current]
-
-        for line in lines[1:]:
+        prev_blank = False
+        # Identical-line stage: the pending line and how often it repeated
+        current: str | None = None
+        count = 0
+        # Similar-line stage: the pending group, its normalized form, and
+        # whether its first line is progress output (computed on demand)
+        group: list[str] = []
+        group_normalized = ""
+        group_heavy: bool | None = None
+
+        def group_similar(line: str) -> None:
+            nonlocal group, group_normalized, group_heavy
             normalized = self._normalize_numbers(line)
-            if (
-                normalized == current_normalized
-                and current.strip()
-                and len(current.strip()) > 10
-                and self._is_numeric_heavy(current)
-            ):
-                group.append(line)
-            else:
-                self._flush_similar(result, group)
-                current = line
-                current_normalized = normalized
-                group = [line]
-
+            if group and normalized == group_normalized:
+                if group_heavy is None:
+                    first = group[0]
+                    group_heavy = len(first.strip()) > 10 and self._is_numeric_heavy(first)
+                if group_heavy:
+                    group.append(line)
+                    return
+            self._flush_similar(result, group)
+            group = [line]
+            group_normalized = normalized
+            group_heavy = None
+
+        emit = group_similar if collapse_similar else result.append
+        for line in lines:
+            stripped = line.strip()
+            if self._is_progress_line(stripped):
+                continue
+            is_blank = not stripped
+            if is_blank and prev_blank:
+                continue
+            prev_blank = is_blank
+            if line == current and stripped:
+                count += 1
+                continue
+            if current is not None:
+                emit(self._format_repeated(current, count).rstrip())
+            current = line
+            count = 1
+        if current is not None:
+            emit(self._format_repeated(current, count).rstrip())
         self._flush_similar(result, group)
         return result
 
+    def _is_progress_line(self, stripped: str) -> bool:
+        """Return True for lines that are purely progress bars or spinners."""
+        if not stripped:
+            return False
+        # Unicode block bars: always progress noise.
+        block = _PROGRESS_BLOCK_RE.search(stripped)
+        if block and len(block.group(0)) > len(stripped) * 0.5:
+            return True
+        # ASCII bars (====, ####, ---->): only strip when accompanied by a
+        # progress signal (%, [..], n/m, rate, ETA).  A bare "--------" or
+        # "========" line is a separator/rule and must survive.
+        ascii_bar = _ASCII_BAR_RE.search(stripped)
+        if (
+            ascii_bar
+            and len(ascii_bar.group(0)) > len(stripped) * 0.5
+            and _PROGRESS_CONTEXT_RE.search(stripped)
+        ):
+            return True
+        # Spinner lines
+        return stripped in _SPINNER_GLYPHS
+
     def _normalize_numbers(self, line: str) -> str:
-        """Replace all numbers with a placeholder for fuzzy comparison."""
-        return _NUMERIC_RE.sub("N", line.strip())
+        """Drop all digits so lines differing only in numbers compare equal.
+
+        Deleting digits (rather than mapping each to a placeholder) keeps
+        "9%" and "10%" equal.  Decimal points are kept, which is harmless for
+        grouping consecutive progress redraws.
+        """
+        return line.strip().translate(_DIGIT_KILLER)
 
     def _is_numeric_heavy(self, line: str) -> bool:
         """Check if a line is progress/status output where numbers are noise.
@@ -177,7 +157,10 @@ class GenericProcessor(Processor):
         such as progress bars, download stats, and transfer indicators.
         """
         stripped = line.strip()
-        if not stripped:
+        # Every signal below needs at least one digit; most lines have none,
+        # so bail out before any regex work.
+        numeric_chars = len(stripped) - len(stripped.translate(_DIGIT_KILLER))
+        if not numeric_chars:
             return False
         # Only collapse on EXPLICIT progress/transfer signals.  Bare digit-ratio
         # heuristics are deliberately NOT used: they also match legitimate
@@ -193,14 +176,12 @@ class GenericProcessor(Processor):
         if re.search(r"(ETA|eta)\s+\d+", stripped):
             return True
         # Curl/wget progress format: lines with --:--:-- time patterns
-        numeric_chars = sum(1 for c in stripped if c.isdigit())
-        return bool(re.search(r"--:--:--|(\d+:){2}\d+", stripped) and numeric_chars >= 5)
+        return numeric_chars >= 5 and bool(re.search(r"--:--:--|(\d+:){2}\d+", stripped))
 
-    def _flush(self, result: list[str], line: str, count: int) -> None:
+    def _format_repeated(self, line: str, count: int) -> str:
         if count > 1:
-            result.append(f"{line} (x{count})")
-        else:
-            result.append(line)
+            return f"{line} (x{count})"
+        return line
 
     def _flush_similar(self, result: list[str], group: list[str]) -> None:
         count = len(group)
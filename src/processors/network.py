@@ -6,6 +6,102 @@ import re
 from .base import Processor
 from .utils import compress_json_value
 
+_CURL_CMD_RE = re.compile(r"\bcurl\b")
+_WGET_CMD_RE = re.compile(r"\bwget\b")
+_CURL_OR_WGET_CMD_RE = re.compile(r"\b(curl|wget)\b")
+_HTTPIE_CMD_RE = re.compile(r"^\s*(http|https)\s+")
+_CURL_VERBOSE_RE = re.compile(r"\s-[a-zA-Z]*v|--verbose")
+
+_CURL_REQ_HEADER_METHOD_RE = re.compile(r"^(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s+")
+_HTTP_STATUS_RE = re.compile(r"^HTTP/")
+_CURL_PROGRESS_TABLE_HEADER_RE = re.compile(r"%\s+Total\s+%\s+Received")
+_CURL_PROGRESS_UNITS_RE = re.compile(r"Dload\s+Upload")
+_CURL_PROGRESS_DATA_RE = re.compile(r"^\s*\d+\s+\d+.*(?:--:--:--|(?:\d+:){2}\d+)")
+_CURL_INFO_ERROR_RE = re.compile(r"(error|fail|could not|refused)", re.I)
+
+# TLS/SSL handshake and connection noise in verbose curl output, recognized
+# by the first word after "* " (trailing ":" ignored) or by a leading phrase.
+_CURL_TLS_NOISE_WORDS = frozenset(
+    {
+        "SSL",
+        "TLS",
+        "ALPN",
+        "CAfile",
+        "CApath",
+        "Certificate",
+        "issuer",
+        "subject",
+        "subjectAlt",
+        "Connected",
+        "Trying",
+        "expire",
+        "start",
+        "TCP_NODELAY",
+        "Closing",
+    }
+)
+_CURL_TLS_NOISE_PHRASES = (
+    "Server certificate",
+    "Connection #",
+    "Mark bundle",
+    "upload completely",
+    "Using Stream",
+    "old SSL",
+    "successfully set certificate",
+)
+
+# Verbose curl line classes, tried in order; dispatch on ``match.lastgroup``.
+# Lines matching none of them are kept (response body or unknown output).
+_CURL_LINE_PATTERNS = (
+    ("req", r"> "),
+    ("resp", r"< "),
+    ("progress_hdr", _CURL_PROGRESS_TABLE_HEADER_RE.pattern),
+    ("progress", _CURL_PROGRESS_DATA_RE.pattern),
+    ("info", r"\* "),
+)
+_CURL_LINE_RE = re.compile("|".join(f"(?P<{kind}>{pat})" for kind, pat in _CURL_LINE_PATTERNS))
+
+# Response headers worth keeping (prefix match on the lowercased name)
+_CURL_IMPORTANT_HEADERS = (
+    "content-type",
+    "location",
+    "www-authenticate",
+    "set-cookie",
+    "x-ratelimit",
+    "retry-after",
+    "authorization",
+    "content-length",
+    "transfer-encoding",
+    "access-control-allow-origin",
+    "x-request-id",
+)
+
+_WGET_USEFUL_RE = re.compile(
+    r"^(Length:|Saving to:|Location:|HTTP request sent|--\d{4})"
+    r"|^\d{3}\s"
+    r"|\b(saved|ERROR|error|failed|refused|not found)\b",
+    re.I,
+)
+
+_HTTPIE_HEADER_RE = re.compile(r"^[\w-]+:")
+_HTTPIE_IMPORTANT_HEADERS = (
+    "content-type",
+    "location",
+    "set-cookie",
+    "www-authenticate",
+    "content-length",
+    "x-request-id",
+)
+
+_HTML_COUNT_RES = {
+    "links": re.compile(r"<a\b", re.IGNORECASE),
+    "images": re.compile(r"<img\b", re.IGNORECASE),
+    "scripts": re.compile(r"<script\b", re.IGNORECASE),
+    "stylesheets": re.compile(r"<link\b[^>]*stylesheet", re.IGNORECASE),
+    "forms": re.compile(r"<form\b", re.IGNORECASE),
+    "inputs": re.compile(r"<input\b", re.IGNORECASE),
+}
+
 
 class NetworkProcessor(Processor):
     priority = 30
@@ -20,26 +116,24 @@ class NetworkProcessor(Processor):
     def can_handle(self, command: str) -> bool:
         # Match curl, wget, or httpie (http/https commands at start of line)
         # Avoid false positives: only match http/https as standalone commands, not as URLs
-        return bool(
-            re.search(r"\b(curl|wget)\b", command) or re.match(r"^\s*(http|https)\s+", command)
-        )
+        return bool(_CURL_OR_WGET_CMD_RE.search(command) or _HTTPIE_CMD_RE.match(command))
 
     def process(self, command: str, output: str) -> str:
         if not output or not output.strip():
             return output
 
-        if re.search(r"\bcurl\b", command):
+        if _CURL_CMD_RE.search(command):
             return self._process_curl(output, command)
-        if re.search(r"\bwget\b", command):
+        if _WGET_CMD_RE.search(command):
             return self._process_wget(output)
-        if re.match(r"^\s*(http|https)\s+", command):
+        if _HTTPIE_CMD_RE.match(command):
             return self._process_httpie(output)
         return output
 
     def _process_curl(self, output: str, command: str) -> str:
         lines = output.splitlines()
 
-        is_verbose = re.search(r"\s-[a-zA-Z]*v|--verbose", command)
+        is_verbose = _CURL_VERBOSE_RE.search(command)
         if not is_verbose:
             # Non-verbose curl: strip progress meter, then try body compression
             stripped = self._strip_curl_progress(lines)
@@ -47,52 +141,30 @@ class NetworkProcessor(Processor):
 
         # Verbose curl: strip TLS, connection, boilerplate headers
         result = []
-
-        # Headers worth keeping in the response
-        important_headers = {
-            "content-type",
-            "location",
-            "www-authenticate",
-            "set-cookie",
-            "x-ratelimit",
-            "retry-after",
-            "authorization",
-            "content-length",
-            "transfer-encoding",
-            "access-control-allow-origin",
-            "x-request-id",
-        }
-
         body_lines = []
         in_body = False
 
         for line in lines:
             stripped = line.strip()
+            m = _CURL_LINE_RE.match(stripped)
+            kind = m.lastgroup if m else None
 
-            # TLS/SSL handshake noise
-            if re.match(
-                r"^\*\s*(SSL|TLS|ALPN|CAfile|CApath|Certificate|issuer|subject|"
-                r"subjectAlt|Server certificate|Connected|Trying|"
-                r"Connection(ed| #\d)| *expire| *start|"
-                r"TCP_NODELAY|Mark bundle|upload completely|"
-                r"Using Stream|old SSL|Closing|"
-                r"successfully set certificate)\b",
-                stripped,
-            ):
+            # Progress meter table (% Total % Received)
+            if kind in ("progress_hdr", "progress"):
                 continue
 
             # Request headers (> prefix) -- keep only the method line
-            if stripped.startswith("> "):
+            if kind == "req":
                 header_content = stripped[2:].strip()
-                if re.match(r"^(GET|POST|PUT|DELETE|PATCH|HEAD|OPTIONS)\s+", header_content):
+                if _CURL_REQ_HEADER_METHOD_RE.match(header_content):
                     result.append(stripped)
                 continue
 
             # Response headers (< prefix) -- filter
-            if stripped.startswith("< "):
+            if kind == "resp":
                 header_content = stripped[2:].strip()
                 # Status line: always keep
-                if re.match(r"^HTTP/", header_content):
+                if _HTTP_STATUS_RE.match(header_content):
                     result.append(stripped)
                     continue
                 # Empty header line marks end of headers, body starts
@@ -100,22 +172,14 @@ class NetworkProcessor(Processor):
                     in_body = True
                     continue
                 # Check if header is important
-                header_lower = header_content.split(":")[0].lower() if ":" in header_content else ""
-                if any(header_lower.startswith(h) for h in important_headers):
+                header_name, sep, _ = header_content.partition(":")
+                if sep and header_name.lower().startswith(_CURL_IMPORTANT_HEADERS):
                     result.append(stripped)
                 continue
 
-            # Progress meter table (% Total % Received)
-            if re.match(r"^\s+%\s+Total\s+%\s+Received", stripped):
-                continue
-            if re.match(r"^\s*\d+\s+\d+", stripped) and re.search(
-                r"--:--:--|(\d+:){2}\d+", stripped
-            ):
-                continue
-
-            # Info lines with * prefix -- keep only errors
-            if stripped.startswith("* ") and not re.search(
-                r"(error|fail|could not|refused)", stripped, re.I
+            # Info lines with * prefix -- drop TLS/connection noise, keep only errors
+            if kind == "info" and (
+                self._is_curl_tls_noise(stripped) or not _CURL_INFO_ERROR_RE.search(stripped)
             ):
                 continue
 
@@ -133,6 +197,14 @@ class NetworkProcessor(Processor):
 
         return "\n".join(result)
 
+    def _is_curl_tls_noise(self, stripped: str) -> bool:
+        """Return True for a "* " info line that is TLS/SSL or connection chatter."""
+        rest = stripped[2:].lstrip()
+        if not rest:
+            return False
+        word = rest.split(None, 1)[0].rstrip(":")
+        return word in _CURL_TLS_NOISE_WORDS or rest.startswith(_CURL_TLS_NOISE_PHRASES)
+
     def _strip_curl_progress(self, lines: list[str]) -> str:
         """Strip curl progress meter from non-verbose output."""
         result = []
@@ -140,16 +212,14 @@ class NetworkProcessor(Processor):
         for line in lines:
             stripped = line.strip()
             # Progress table header
-            if re.search(r"%\s+Total\s+%\s+Received", stripped):
+            if _CURL_PROGRESS_TABLE_HEADER_RE.search(stripped):
                 in_progress_table = True
                 continue
             # Second header line (Dload/Upload columns)
-            if in_progress_table and re.search(r"Dload\s+Upload", stripped):
+            if in_progress_table and _CURL_PROGRESS_UNITS_RE.search(stripped):
                 continue
             # Progress data lines (numbers with time patterns)
-            if re.match(r"^\s*\d+\s+\d+", stripped) and re.search(
-                r"--:--:--|(\d+:){2}\d+", stripped
-            ):
+            if _CURL_PROGRESS_DATA_RE.match(stripped):
                 in_progress_table = False
                 continue
             in_progress_table = False
@@ -217,14 +287,7 @@ class NetworkProcessor(Processor):
         h1_m = self._HTML_H1_RE.search(stripped)
         h1 = self._HTML_TAG_STRIP_RE.sub("", h1_m.group(1)).strip()[:120] if h1_m else None
 
-        counts = {
-            "links": len(re.findall(r"<a\b", stripped, re.IGNORECASE)),
-            "images": len(re.findall(r"<img\b", stripped, re.IGNORECASE)),
-            "scripts": len(re.findall(r"<script\b", stripped, re.IGNORECASE)),
-            "stylesheets": len(re.findall(r"<link\b[^>]*stylesheet", stripped, re.IGNORECASE)),
-            "forms": len(re.findall(r"<form\b", stripped, re.IGNORECASE)),
-            "inputs": len(re.findall(r"<input\b", stripped, re.IGNORECASE)),
-        }
+        counts = {key: len(pat.findall(stripped)) for key, pat in _HTML_COUNT_RES.items()}
 
         parts = [
             f"[HTML page, {len(stripped)} chars, {len(text.splitlines())} lines]",
@@ -245,18 +308,11 @@ class NetworkProcessor(Processor):
         lines = output.splitlines()
         result = []
 
-        _useful_re = re.compile(
-            r"^(Length:|Saving to:|Location:|HTTP request sent|--\d{4})"
-            r"|^\d{3}\s"
-            r"|\b(saved|ERROR|error|failed|refused|not found)\b",
-            re.I,
-        )
-
         for line in lines:
             stripped = line.strip()
             if not stripped:
                 continue
-            if _useful_re.search(stripped):
+            if _WGET_USEFUL_RE.search(stripped):
                 result.append(stripped)
 
         return "\n".join(result) if result else output
@@ -272,23 +328,15 @@ class NetworkProcessor(Processor):
             stripped = line.strip()
 
             # Status line: HTTP/1.1 200 OK
-            if re.match(r"^HTTP/", stripped):
+            if _HTTP_STATUS_RE.match(stripped):
                 result.append(line)
                 continue
 
             # Headers (key: value format before body)
-            if not in_body and re.match(r"^[\w-]+:", stripped):
-                header_name = stripped.split(":")[0].lower()
+            if not in_body and _HTTPIE_HEADER_RE.match(stripped):
                 # Keep important headers
-                important = {
-                    "content-type",
-                    "location",
-                    "set-cookie",
-                    "www-authenticate",
-                    "content-length",
-                    "x-request-id",
-                }
-                if any(header_name.startswith(h) for h in important):
+                header_name = stripped.partition(":")[0].lower()
+                if header_name.startswith(_HTTPIE_IMPORTANT_HEADERS):
                     result.append(line)
                 continue
 
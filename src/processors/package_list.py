@@ -1,85 +1,94 @@
 """Package listing processor: pip list/freeze, npm ls/list, conda list."""
 
 import re
+from collections.abc import Iterable
+from itertools import islice
 
 from .base import Processor
 
+_NPM_RE = re.compile(r"\bnpm\s+(ls|list)\b")
+_PIP_FREEZE_RE = re.compile(r"\bpip3?\s+freeze\b")
+_PIP_LIST_RE = re.compile(r"\bpip3?\s+list\b")
+_CONDA_RE = re.compile(r"\bconda\s+list\b")
+_YARN_PNPM_RE = re.compile(r"\b(yarn|pnpm)\s+list\b")
+_GEM_RE = re.compile(r"\bgem\s+list\b")
+_BREW_RE = re.compile(r"\bbrew\s+list\b")
+
+
+_NPM_TOPLEVEL_RE = re.compile(r"^(?:[├└]──\s+|[+`]-\s+)")
+# npm ls tree lines: an indent of continuation glyphs, then a branch glyph.
+# Each branch glyph maps to the continuation glyph of the other drawing style
+# (unicode vs ASCII), which may not appear in its indent.
+_NPM_TREE_INDENT = "│| "
+_NPM_TREE_BRANCHES = {"├": "|", "└": "|", "+": "│", "`": "│"}
+
+
+def _has_npm_issue(line: str) -> bool:
+    """Return True if ``line`` mentions UNMET, invalid, missing, ERR! or WARN (any case)."""
+    low = line.lower()
+    return "unmet" in low or "invalid" in low or "missing" in low or "err!" in low or "warn" in low
+
+
+def _is_pip_list_header(line: str) -> bool:
+    """Return True for pip list's ``Package  Version`` and ``-------  -------`` header lines."""
+    if line[:1] == "-":
+        rest = line.lstrip("-")
+        return rest[:1].isspace() and rest.lstrip().startswith("-")
+    return (
+        line.startswith("Package")
+        and line[7:8].isspace()
+        and line[7:].lstrip().startswith("Version")
+    )
+
 
 class PackageListProcessor(Processor):
     priority = 15
     hook_patterns = [
         r"^(pip3?\s+(list|freeze)|npm\s+(ls|list)|conda\s+list|gem\s+list|brew\s+list)\b",
     ]
+    handle_pattern = (
+        r"\b(pip3?\s+(list|freeze)|npm\s+(ls|list)|conda\s+list|"
+        r"yarn\s+list|pnpm\s+list|gem\s+list|brew\s+list)\b"
+    )
+    handle_keywords = ("pip", "npm", "conda", "yarn", "gem", "brew")
 
     @property
     def name(self) -> str:
         return "package_list"
 
-    def can_handle(self, command: str) -> bool:
-        return bool(
-            re.search(
-                r"\b(pip3?\s+(list|freeze)|npm\s+(ls|list)|conda\s+list|"
-                r"yarn\s+list|pnpm\s+list|gem\s+list|brew\s+list)\b",
-                command,
-            )
-        )
-
     def process(self, command: str, output: str) -> str:
         if not output or not output.strip():
             return output
 
-        if re.search(r"\bnpm\s+(ls|list)\b", command):
+        if _NPM_RE.search(command):
             return self._process_npm_ls(output)
-        if re.search(r"\bpip3?\s+freeze\b", command):
+        if _PIP_FREEZE_RE.search(command):
             return self._process_pip_freeze(output)
-        if re.search(r"\bpip3?\s+list\b", command):
+        if _PIP_LIST_RE.search(command):
             return self._process_pip_list(output)
-        if re.search(r"\bconda\s+list\b", command):
+        if _CONDA_RE.search(command):
             return self._process_conda_list(output)
-        if re.search(r"\b(yarn|pnpm)\s+list\b", command):
+        if _YARN_PNPM_RE.search(command):
             return self._process_npm_ls(output)
-        if re.search(r"\bgem\s+list\b", command):
+        if _GEM_RE.search(command):
             return self._process_gem_list(output)
-        if re.search(r"\bbrew\s+list\b", command):
+        if _BREW_RE.search(command):
             return self._process_simple_list(output, "formulae")
         return output
 
     def _process_pip_list(self, output: str) -> str:
         """Compress pip list: show count + first entries."""
-        lines = output.splitlines()
-
         # Skip header lines (Package/Version separator)
-        data_lines = []
-        for line in lines:
-            stripped = line.strip()
-            if re.match(r"^-+\s+-+", stripped):
-                continue
-            if re.match(r"^Package\s+Version", stripped):
-                continue
-            if stripped:
-                data_lines.append(stripped)
-
-        if len(data_lines) <= 20:
-            return output
-
-        result = [f"{len(data_lines)} packages installed:"]
-        for line in data_lines[:15]:
-            result.append(f"  {line}")
-        result.append(f"  ... ({len(data_lines) - 15} more)")
-        return "\n".join(result)
+        entries = (
+            stripped
+            for stripped in map(str.strip, output.splitlines())
+            if stripped and not _is_pip_list_header(stripped)
+        )
+        return self._summarize_entries(output, entries, "packages installed")
 
     def _process_pip_freeze(self, output: str) -> str:
         """Compress pip freeze: show count + first entries."""
-        lines = [line.strip() for line in output.splitlines() if line.strip()]
-
-        if len(lines) <= 20:
-            return output
-
-        result = [f"{len(lines)} packages:"]
-        for line in lines[:15]:
-            result.append(f"  {line}")
-        result.append(f"  ... ({len(lines) - 15} more)")
-        return "\n".join(result)
+        return self._process_simple_list(output, "packages")
 
     def _process_npm_ls(self, output: str) -> str:
         """Compress npm ls: collapse dependency tree, keep top-level + issues."""
@@ -90,40 +99,40 @@ class PackageListProcessor(Processor):
         top_level = []
         issues = []
         total_deps = 0
+        toplevel_match = _NPM_TOPLEVEL_RE.match
+        branches = _NPM_TREE_BRANCHES
 
         for line in lines:
             stripped = line.strip()
 
             # Unmet/invalid dependencies — always keep
-            if re.search(r"(UNMET|invalid|missing|ERR!|WARN)", stripped, re.I):
+            if _has_npm_issue(stripped):
                 issues.append(stripped)
                 continue
 
-            # Top-level: lines with only one level of tree indent (├── or └──)
-            if re.match(r"^[├└]──\s+", line) or re.match(r"^[+`]-\s+", line):
-                top_level.append(stripped)
-                total_deps += 1
-                continue
-
-            # Deeper dependencies
-            if re.match(r"^[│ ]*[├└]", line) or re.match(r"^[| ]*[+`]", line):
+            # Tree lines: dispatch on the first glyph after the indent
+            indent = len(line) - len(line.lstrip(_NPM_TREE_INDENT))
+            foreign = branches.get(line[indent : indent + 1])
+            if foreign is not None and foreign not in line[:indent]:
                 total_deps += 1
+                # Top-level: lines with only one level of tree indent (├── or └──)
+                if indent == 0 and toplevel_match(line):
+                    top_level.append(stripped)
                 continue
 
             # Root line or summary
-            if line and not line.startswith(" "):
+            if line[:1] not in ("", " "):
                 top_level.insert(0, stripped)
 
         result = [f"{total_deps} total dependencies:"]
         if issues:
             result.append(f"Issues ({len(issues)}):")
-            for issue in issues[:10]:
-                result.append(f"  {issue}")
+            result.append("  " + "\n  ".join(issues[:10]))
             if len(issues) > 10:
                 result.append(f"  ... ({len(issues) - 10} more)")
         result.append(f"Top-level ({len(top_level)}):")
-        for pkg in top_level[:20]:
-            result.append(f"  {pkg}")
+        if top_level:
+            result.append("  " + "\n  ".join(top_level[:20]))
         if len(top_level) > 20:
             result.append(f"  ... ({len(top_level) - 20} more)")
 
@@ -131,17 +140,12 @@ class PackageListProcessor(Processor):
 
     def _process_conda_list(self, output: str) -> str:
         """Compress conda list output."""
-        lines = output.splitlines()
-        data_lines = [line for line in lines if line.strip() and not line.startswith("#")]
-
-        if len(data_lines) <= 20:
-            return output
-
-        result = [f"{len(data_lines)} packages installed:"]
-        for line in data_lines[:15]:
-            result.append(f"  {line.strip()}")
-        result.append(f"  ... ({len(data_lines) - 15} more)")
-        return "\n".join(result)
+        entries = (
+            stripped
+            for line in output.splitlines()
+            if line[:1] != "#" and (stripped := line.strip())
+        )
+        return self._summarize_entries(output, entries, "packages installed")
 
     def _process_gem_list(self, output: str) -> str:
         """Compress gem list output."""
@@ -149,12 +153,20 @@ class PackageListProcessor(Processor):
 
     def _process_simple_list(self, output: str, item_type: str) -> str:
         """Generic list compressor for simple one-item-per-line lists."""
-        lines = [line.strip() for line in output.splitlines() if line.strip()]
-        if len(lines) <= 20:
+        entries = (stripped for stripped in map(str.strip, output.splitlines()) if stripped)
+        return self._summarize_entries(output, entries, item_type)
+
+    def _summarize_entries(self, output: str, entries: Iterable[str], label: str) -> str:
+        """Summarize list entries as a count plus the first 15.
+
+        ``entries`` is consumed lazily: only the shown entries are kept, the
+        rest are just counted.  Lists of 20 entries or fewer are returned as-is.
+        """
+        entries = iter(entries)
+        shown = list(islice(entries, 15))
+        count = len(shown) + sum(1 for _ in entries)
+        if count <= 20:
             return output
 
-        result = [f"{len(lines)} {item_type}:"]
-        for line in lines[:15]:
-            result.append(f"  {line}")
-        result.append(f"  ... ({len(lines) - 15} more)")
-        return "\n".join(result)
+        # Indent the shown entries with one join instead of a string per entry
+        return f"{count} {label}:\n  " + "\n  ".join(shown) + f"\n  ... ({count - 15} more)"
@@ -2,24 +2,56 @@
 
 import re
 from collections import defaultdict
+from itertools import islice
 
 from .. import config
 from .base import Processor
 
+_BINARY_FILE_PREFIX = "Binary file "
+
+
+def _match_file_path(line: str) -> str | None:
+    """Return the file path of a ``file:line:content`` or ``file:content`` line.
+
+    A ``file:`` prefix (optionally after a Windows drive letter) counts when
+    the file has an extension, or when a line number follows.  Parsed by hand
+    with ``str`` methods; returns None for plain matches.
+    """
+    drive = line[:1]
+    starts = (2, 0) if line[1:2] == ":" and drive.isascii() and drive.isalpha() else (0,)
+
+    candidates = []
+    for start in starts:
+        colon = line.find(":", start)
+        if colon < 0:
+            continue
+        segment = line[start:colon]
+        if segment.split() == [segment]:
+            candidates.append((line[:colon], segment, line[colon + 1 :]))
+
+    for path, segment, _rest in candidates:
+        stem, _dot, ext = segment.rpartition(".")
+        if stem and ext.isascii() and ext.isalnum():
+            return path
+    for path, _segment, rest in candidates:
+        lineno, sep, _content = rest.partition(":")
+        if sep and lineno.isdecimal():
+            return path
+    return None
+
 
 class SearchProcessor(Processor):
     priority = 35
     hook_patterns = [
         r"^(grep|rg|ag|fd|fdfind)\b",
     ]
+    handle_pattern = r"^\s*(?:\S*/)?(grep|rg|ag|fd|fdfind)\b"
+    handle_keywords = ("grep", "rg", "ag", "fd")
 
     @property
     def name(self) -> str:
         return "search"
 
-    def can_handle(self, command: str) -> bool:
-        return bool(re.match(r"\s*(?:\S*/)?(grep|rg|ag|fd|fdfind)\b", command))
-
     def process(self, command: str, output: str) -> str:
         if not output or not output.strip():
             return output
@@ -42,16 +74,21 @@ class SearchProcessor(Processor):
                 continue
 
             # Skip binary file warnings
-            if re.match(r"^Binary file .* matches", stripped):
+            if (
+                stripped.startswith(_BINARY_FILE_PREFIX)
+                and " matches" in stripped[len(_BINARY_FILE_PREFIX) :]
+            ):
+                continue
+
+            # Without a colon the line cannot be file:line:content or file:content
+            if ":" not in stripped:
+                plain_matches.append(stripped)
                 continue
 
             # file:line:content or file:content
             # Accept extensionless files if a line number follows
-            m = re.match(r"^((?:[a-zA-Z]:)?[^\s:]+\.[a-zA-Z0-9]+):(\d+:)?(.*)$", stripped)
-            if not m:
-                m = re.match(r"^((?:[a-zA-Z]:)?[^\s:]+):(\d+:)(.*)$", stripped)
-            if m:
-                filepath = m.group(1)
+            filepath = _match_file_path(stripped)
+            if filepath is not None:
                 by_file[filepath].append(stripped)
             else:
                 plain_matches.append(stripped)
@@ -87,14 +124,10 @@ class SearchProcessor(Processor):
             count = len(matches)
             if count > max_per_file:
                 result.append(f"{filepath}: ({count} matches)")
-                for match_line in matches[:max_per_file]:
-                    # Strip the filepath prefix to avoid repetition
-                    display = match_line
-                    if display.startswith(filepath + ":"):
-                        display = "  " + display[len(filepath) + 1 :]
-                    else:
-                        display = "  " + display
-                    result.append(display)
+                # Strip the filepath prefix to avoid repetition
+                prefix = filepath + ":"
+                for match_line in islice(matches, max_per_file):
+                    result.append("  " + match_line.removeprefix(prefix))
                 result.append(f"  ... ({count - max_per_file} more)")
             else:
                 for match_line in matches:
@@ -139,9 +172,9 @@ class SearchProcessor(Processor):
                 fname = filepath.rsplit("/", 1)[-1]
                 if len(matches) > max_per_file:
                     result.append(f"  {fname}: ({len(matches)} matches)")
-                    for m in matches[:max_per_file]:
-                        display = m[len(filepath) + 1 :] if m.startswith(filepath + ":") else m
-                        result.append(f"    {display}")
+                    prefix = filepath + ":"
+                    for m in islice(matches, max_per_file):
+                        result.append(f"    {m.removeprefix(prefix)}")
                 else:
                     for m in matches:
                         result.append(f"  {m}")
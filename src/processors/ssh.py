@@ -52,7 +52,7 @@ class SshProcessor(Processor):
                 last_progress = line
             elif re.search(r"\b(error|Error|ERROR|denied|refused|No such)\b", stripped):
                 result.append(line)
-            elif stripped and not _SCP_PROGRESS_RE.match(stripped):
+            elif stripped:
                 if last_progress:
                     result.append(last_progress)
                     last_progress = None
@@ -4,9 +4,54 @@ import re
 
 from .base import Processor
 
-_TF_CMD_RE = re.compile(
-    r"\b(terraform|tofu)\s+(plan|apply|destroy|init|output|validate|fmt|state\s+(?:list|show))\b"
+_TF_RESOURCE_HEADER_RE = re.compile(r"^#\s+\S+")
+_TF_OUTPUT_VALUE_RE = re.compile(r"^\s*[+~-]\s+\w+\s*=")
+_TF_CHANGE_PREFIXES = ("+", "~", "-")
+_TF_ERROR_WARNING_RE = re.compile(r"\b(Error|Warning|error|warning)\b")
+_TF_PROVIDER_VERSION_RE = re.compile(r"\bv\d+\.\d+")
+_TF_INIT_SUCCESS_RE = re.compile(
+    r"(successfully initialized|has been successfully|Terraform has been)", re.I
 )
+_TF_UPGRADE_NOTICE_RE = re.compile(r"(upgrade available|new version|rerun with -upgrade)", re.I)
+_TF_KEY_PREFIX_RE = re.compile(r"^(\S+\s*=\s*)")
+_TF_STATE_KEY_PREFIX_RE = re.compile(r"^(\s*\S+\s*=\s*)")
+_TF_RESOURCE_TYPE_RE = re.compile(r"^[a-z]+_")
+
+# Leading words of provider/backend initialization chatter (each followed by whitespace)
+_TF_PLAN_SKIP_WORDS = ("Initializing", "Acquiring", "Installing", "Reusing")
+_TF_INIT_SKIP_WORDS = (*_TF_PLAN_SKIP_WORDS, "Finding", "Using")
+_TF_PLAN_SKIP_FIRST = frozenset(word[0] for word in _TF_PLAN_SKIP_WORDS)
+
+# Lines always kept outside resource blocks, keyed on their first character
+_TF_PLAN_KEEP_PREFIXES = {
+    "P": ("Plan:",),
+    "A": ("Apply complete",),
+    "D": ("Destroy complete",),
+    "N": ("No changes", "Note:"),
+    "C": ("Changes to Outputs:",),
+}
+
+
+def _has_error_or_warning(line: str) -> bool:
+    """Return True if ``line`` contains the word Error, error, Warning or warning.
+
+    The substring probe rejects the vast majority of lines before the
+    word-boundary regex runs.
+    """
+    return ("rror" in line or "arning" in line) and bool(_TF_ERROR_WARNING_RE.search(line))
+
+
+def _starts_with_word(line: str, words: tuple[str, ...]) -> bool:
+    """Return True if ``line`` starts with one of ``words`` followed by whitespace."""
+    if not line.startswith(words):
+        return False
+    parts = line.split(None, 1)
+    return len(parts) == 2 and parts[0] in words
+
+
+def _is_dash_item(line: str) -> bool:
+    """Return True for ``- item`` list lines (a dash followed by whitespace)."""
+    return line.startswith("-") and line[1:2].isspace()
 
 
 class TerraformProcessor(Processor):
@@ -14,17 +59,19 @@ class TerraformProcessor(Processor):
     hook_patterns = [
         r"^(terraform|tofu)\s+(plan|apply|destroy|init|output|validate|fmt|state\s+(list|show))\b",
     ]
+    handle_pattern = (
+        r"\b(terraform|tofu)\s+"
+        r"(plan|apply|destroy|init|output|validate|fmt|state\s+(?:list|show))\b"
+    )
+    handle_keywords = ("terraform", "tofu")
 
     @property
     def name(self) -> str:
         return "terraform"
 
-    def can_handle(self, command: str) -> bool:
-        return bool(_TF_CMD_RE.search(command))
-
     def _get_subcmd(self, command: str) -> str | None:
         """Extract the terraform subcommand."""
-        m = _TF_CMD_RE.search(command)
+        m = self._handle_re.search(command)
         return m.group(2) if m else None
 
     def process(self, command: str, output: str) -> str:
@@ -47,28 +94,36 @@ class TerraformProcessor(Processor):
 
     def _process_plan_apply(self, lines: list[str]) -> str:
         """Compress terraform plan/apply/destroy output."""
-        result = []
+        result: list[str] = []
+        append = result.append
         in_resource_block = False
         resource_action = ""
+        header_match = _TF_RESOURCE_HEADER_RE.match
+        output_value_match = _TF_OUTPUT_VALUE_RE.match
+        keep_prefixes = _TF_PLAN_KEEP_PREFIXES.get
 
         for line in lines:
             stripped = line.strip()
+            first = stripped[:1]
+            is_change = first in _TF_CHANGE_PREFIXES
 
-            # Provider initialization -- skip
-            if re.match(r"^(Initializing|Acquiring|Installing|Reusing)\s+", stripped):
+            # Provider initialization and backend info -- skip
+            if first in _TF_PLAN_SKIP_FIRST and _starts_with_word(stripped, _TF_PLAN_SKIP_WORDS):
                 continue
-            if re.match(r"^-\s+Installed\s+", stripped):
+            if (
+                first == "-"
+                and _is_dash_item(stripped)
+                and _starts_with_word(stripped[1:].lstrip(), ("Installed",))
+            ):
                 continue
-
-            # Backend/state info -- skip
-            if re.match(r"^(Initializing the backend|Successfully configured)", stripped):
+            if first == "S" and stripped.startswith("Successfully configured"):
                 continue
 
             # Resource change header: # resource.name will be created/destroyed/updated
-            if re.match(r"^#\s+\S+", stripped) or re.match(r"^\s+#\s+\S+", stripped):
+            if first == "#" and header_match(stripped):
                 in_resource_block = True
                 resource_action = ""
-                result.append(line)
+                append(line)
                 # Extract action
                 if "will be created" in stripped:
                     resource_action = "+"
@@ -78,75 +133,39 @@ class TerraformProcessor(Processor):
                     resource_action = "~"
                 continue
 
-            # Resource block boundary
-            if in_resource_block and re.match(r"^\s*[+~-]\s+resource\s+", stripped):
-                result.append(line)
-                continue
-            if in_resource_block and stripped == "}":
-                in_resource_block = False
-                result.append(line)
-                continue
-
-            # Inside resource block -- filter attributes
             if in_resource_block:
-                # Changed attributes (lines with -> or ~ prefix)
-                if "->" in stripped or re.match(r"^\s*[~+-]", stripped):
-                    result.append(line)
-                    continue
-
-                # Known-after-apply -- keep the key, it shows what will change
-                if "(known after apply)" in stripped:
-                    result.append(line)
-                    continue
-
-                # Forces replacement -- important
-                if "forces replacement" in stripped:
-                    result.append(line)
-                    continue
-
-                # For create (+) actions, keep all attributes (they're new)
-                if resource_action == "+":
-                    result.append(line)
-                    continue
-
-                # For destroy (-), just the header is enough
-                if resource_action == "-":
-                    continue
-
-                # For update (~), skip unchanged attributes
-                continue
-
-            # Plan/Apply summary lines -- always keep
-            if re.match(r"^Plan:", stripped):
-                result.append(line)
-                continue
-            if re.match(r"^(Apply complete|Destroy complete|No changes)", stripped):
-                result.append(line)
-                continue
-
-            # Changes to Outputs -- keep
-            if re.match(r"^Changes to Outputs:", stripped):
-                result.append(line)
-                continue
-
-            # Output values
-            if re.match(r"^\s*[+~-]\s+\w+\s*=", stripped):
-                result.append(line)
-                continue
-
-            # Warnings and errors
-            if re.search(r"\b(Error|Warning|error|warning)\b", stripped):
-                result.append(line)
+                # Resource lines and changed attributes (+, ~, - prefix)
+                if is_change:
+                    append(line)
+                elif stripped == "}":
+                    in_resource_block = False
+                    append(line)
+                # Changed values, known-after-apply keys and replacements are
+                # kept; for create (+) actions every attribute is new. Unchanged
+                # attributes of updates and destroys are dropped.
+                elif (
+                    "->" in stripped
+                    or "(known after apply)" in stripped
+                    or "forces replacement" in stripped
+                    or resource_action == "+"
+                ):
+                    append(line)
                 continue
 
-            # "Note:" lines
-            if re.match(r"^Note:", stripped):
-                result.append(line)
+            # Plan/Apply summary, "Changes to Outputs:", "Note:" lines, output
+            # values, warnings and errors -- always keep
+            prefixes = keep_prefixes(first)
+            if (
+                (prefixes and stripped.startswith(prefixes))
+                or (is_change and "=" in stripped and output_value_match(stripped))
+                or _has_error_or_warning(stripped)
+            ):
+                append(line)
                 continue
 
             # Blank lines between resources
-            if not stripped and in_resource_block is False and result and result[-1].strip():
-                result.append(line)
+            if not stripped and result and result[-1].strip():
+                append(line)
 
         return "\n".join(result) if result else "\n".join(lines)
 
@@ -156,36 +175,33 @@ class TerraformProcessor(Processor):
         if len(lines) <= 20:
             return output
 
-        result = []
+        result: list[str] = []
+        append = result.append
         for line in lines:
             stripped = line.strip()
 
             # Keep provider version info: "- Installed hashicorp/aws v5.31.0 ..."
-            if re.search(r"\bv\d+\.\d+", stripped) and re.match(r"^-\s+", stripped):
-                result.append(stripped)
+            if _is_dash_item(stripped) and _TF_PROVIDER_VERSION_RE.search(stripped):
+                append(stripped)
                 continue
 
             # Keep final result
-            if re.search(
-                r"(successfully initialized|has been successfully|Terraform has been)",
-                stripped,
-                re.I,
-            ):
-                result.append(stripped)
+            if _TF_INIT_SUCCESS_RE.search(stripped):
+                append(stripped)
                 continue
 
             # Keep errors/warnings
-            if re.search(r"\b(Error|Warning|error|warning)\b", stripped):
-                result.append(stripped)
+            if _has_error_or_warning(stripped):
+                append(stripped)
                 continue
 
             # Keep upgrade/reinitialization notices
-            if re.search(r"(upgrade available|new version|rerun with -upgrade)", stripped, re.I):
-                result.append(stripped)
+            if _TF_UPGRADE_NOTICE_RE.search(stripped):
+                append(stripped)
                 continue
 
             # Skip verbose initialization messages
-            if re.match(r"^(Initializing|Acquiring|Installing|Reusing|Finding|Using)\s+", stripped):
+            if _starts_with_word(stripped, _TF_INIT_SKIP_WORDS):
                 continue
 
         if not result:
@@ -202,7 +218,7 @@ class TerraformProcessor(Processor):
         for line in lines:
             # Truncate very long output values
             if len(line) > 200:
-                key_match = re.match(r"^(\S+\s*=\s*)", line)
+                key_match = _TF_KEY_PREFIX_RE.match(line)
                 if key_match:
                     result.append(f"{key_match.group(1)}... ({len(line)} chars)")
                 else:
@@ -219,7 +235,7 @@ class TerraformProcessor(Processor):
             return output
 
         # state list: just resource names
-        if all(re.match(r"^\S", line) for line in lines if line.strip()):
+        if all(not line[0].isspace() for line in lines if line.strip()):
             result = [f"{len(lines)} resources in state:"]
             # Group by resource type
             by_type: dict[str, int] = {}
@@ -230,7 +246,7 @@ class TerraformProcessor(Processor):
                 # Extract type: module.x.aws_instance.y -> aws_instance
                 parts = stripped.split(".")
                 for part in parts:
-                    if re.match(r"^[a-z]+_", part):
+                    if _TF_RESOURCE_TYPE_RE.match(part):
                         by_type[part] = by_type.get(part, 0) + 1
                         break
                 else:
@@ -244,7 +260,7 @@ class TerraformProcessor(Processor):
         result = []
         for line in lines:
             if len(line) > 200:
-                key_match = re.match(r"^(\s*\S+\s*=\s*)", line)
+                key_match = _TF_STATE_KEY_PREFIX_RE.match(line)
                 if key_match:
                     result.append(f"{key_match.group(1)}... ({len(line)} chars)")
                 else:
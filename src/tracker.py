@@ -1,17 +1,122 @@
 """SQLite-based savings tracker with thread safety and auto-pruning."""
 
+import atexit
 import contextlib
 import os
 import sqlite3
 import threading
 import time
 
+# Statements are module constants so sqlite3's per-connection statement cache
+# (keyed by the exact SQL string) reuses their compiled form across calls.
+_SQL_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS savings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        session_id TEXT NOT NULL,
+        command TEXT NOT NULL,
+        processor TEXT NOT NULL,
+        original_size INTEGER NOT NULL,
+        compressed_size INTEGER NOT NULL,
+        platform TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        first_seen REAL NOT NULL,
+        last_seen REAL NOT NULL,
+        total_original INTEGER DEFAULT 0,
+        total_compressed INTEGER DEFAULT 0,
+        command_count INTEGER DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS mismatches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        session_id TEXT NOT NULL,
+        command TEXT NOT NULL,
+        processor TEXT NOT NULL,
+        original_size INTEGER NOT NULL,
+        platform TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_savings_session ON savings(session_id);
+    CREATE INDEX IF NOT EXISTS idx_savings_timestamp ON savings(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_savings_proc_sizes
+        ON savings(processor, original_size, compressed_size);
+    CREATE INDEX IF NOT EXISTS idx_mismatches_ts ON mismatches(timestamp);
+"""
+_SQL_INSERT_SAVING = (
+    "INSERT INTO savings (timestamp, session_id, command, processor, "
+    "original_size, compressed_size, platform) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_UPSERT_SESSION = """
+    INSERT INTO sessions (session_id, first_seen, last_seen,
+                          total_original, total_compressed, command_count)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        last_seen = excluded.last_seen,
+        total_original = total_original + excluded.total_original,
+        total_compressed = total_compressed + excluded.total_compressed,
+        command_count = command_count + excluded.command_count
+"""
+_SQL_INSERT_MISMATCH = (
+    "INSERT INTO mismatches (timestamp, session_id, command, processor, "
+    "original_size, platform) VALUES (?, ?, ?, ?, ?, ?)"
+)
+# (probe, delete) pairs: the DELETE only runs when the probe finds a stale row
+_SQL_PRUNE = (
+    ("SELECT MIN(timestamp) FROM savings", "DELETE FROM savings WHERE timestamp < ?"),
+    ("SELECT MIN(last_seen) FROM sessions", "DELETE FROM sessions WHERE last_seen < ?"),
+    ("SELECT MIN(timestamp) FROM mismatches", "DELETE FROM mismatches WHERE timestamp < ?"),
+)
+_SQL_SESSION_STATS = "SELECT * FROM sessions WHERE session_id = ?"
+_SQL_LIFETIME_STATS = """
+    SELECT
+        COUNT(*) as session_count,
+        COALESCE(SUM(total_original), 0) as total_original,
+        COALESCE(SUM(total_compressed), 0) as total_compressed,
+        COALESCE(SUM(command_count), 0) as total_commands
+    FROM sessions
+"""
+_SQL_TOP_COMMANDS = """
+    SELECT command,
+           COUNT(*) as count,
+           SUM(original_size) as total_original,
+           SUM(compressed_size) as total_compressed,
+           SUM(original_size - compressed_size) as total_saved
+    FROM savings
+    GROUP BY command
+    ORDER BY total_saved DESC
+    LIMIT ?
+"""
+_SQL_TOP_PROC = """
+    SELECT processor,
+           COUNT(*) as count,
+           SUM(original_size) - SUM(compressed_size) as total_saved
+    FROM savings
+    GROUP BY processor
+    ORDER BY total_saved DESC
+    LIMIT ?
+"""
+_SQL_TOP_MISMATCHES = """
+    SELECT processor,
+           COUNT(*) as count,
+           SUM(original_size) as total_original
+    FROM mismatches
+    GROUP BY processor
+    ORDER BY count DESC
+    LIMIT ?
+"""
+
 
 class SavingsTracker:
     """Track token savings in a local SQLite database.
 
     Thread-safe via a reentrant lock on all DB operations.
     Automatically prunes old records on startup.
+
+    Savings rows are buffered in memory and written in batches (see
+    ``_flush``).  The buffer is shared by all trackers on the same DB in this
+    process and flushed before every read, on ``close()`` and at exit, so
+    callers never observe unflushed data.
     """
 
     @staticmethod
@@ -30,6 +135,12 @@ class SavingsTracker:
 
     _lock = threading.RLock()
 
+    # Write-behind buffer of pending savings rows, keyed by DB path.  Flushed
+    # once FLUSH_BATCH rows are queued or the oldest is FLUSH_INTERVAL s old.
+    FLUSH_BATCH = 32
+    FLUSH_INTERVAL = 2.0
+    _pending: dict[str, list[tuple]] = {}
+
     @staticmethod
     def _fallback_session_id() -> str:
         """Session id used when neither a caller nor TOKEN_SAVER_SESSION supplies one.
@@ -41,22 +152,27 @@ class SavingsTracker:
         """
         return f"ppid-{os.getppid()}"
 
+    @classmethod
+    def _resolve_db_paths(cls) -> tuple[str, str]:
+        """Return ``(db_dir, db_path)``: overridden class vars if set, else from data_dir()."""
+        if cls.DB_DIR is None:
+            SavingsTracker.DB_DIR = cls._default_db_dir()
+        if cls.DB_PATH is None:
+            SavingsTracker.DB_PATH = cls._default_db_path()
+        return cls.DB_DIR or cls._default_db_dir(), cls.DB_PATH or cls._default_db_path()
+
+    @classmethod
+    def _resolve_session_id(cls, session_id: str | None) -> str:
+        return session_id or os.environ.get("TOKEN_SAVER_SESSION") or cls._fallback_session_id()
+
     def __init__(self, session_id: str | None = None, prune_days: int = 90):
-        self.session_id = (
-            session_id or os.environ.get("TOKEN_SAVER_SESSION") or self._fallback_session_id()
-        )
+        self.session_id = self._resolve_session_id(session_id)
         self.prune_days = prune_days
-        # Resolve DB paths — use overridden class vars if set, else compute from data_dir()
-        if self.DB_DIR is None:
-            SavingsTracker.DB_DIR = self._default_db_dir()
-        if self.DB_PATH is None:
-            SavingsTracker.DB_PATH = self._default_db_path()
-        self._db_dir: str = self.DB_DIR or self._default_db_dir()
-        self._db_path: str = self.DB_PATH or self._default_db_path()
+        self._db_dir, self._db_path = self._resolve_db_paths()
         os.makedirs(self._db_dir, exist_ok=True)
-        self._open_connection()
-        self._init_db()
+        self._open_db()
         self._maybe_prune()
+        atexit.register(self.close)
 
     def _remove_db_files(self):
         """Delete the DB and its WAL/SHM sidecars.
@@ -69,156 +185,110 @@ class SavingsTracker:
             with contextlib.suppress(OSError):
                 os.remove(self._db_path + suffix)
 
-    def _open_connection(self):
-        """Open SQLite connection, handling corrupted DB files."""
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the DB file and apply the session pragmas.
+
+        WAL with synchronous=NORMAL stays consistent across crashes and only
+        syncs on checkpoints instead of on every commit.
+        """
+        conn = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _open_db(self):
+        """Connect and ensure the schema exists, recreating a corrupted DB file.
+
+        A corrupted file fails on the first pragma or on the schema script;
+        either way it is deleted and opened again exactly once.
+        """
+        conn = None
         try:
-            self.conn = sqlite3.connect(
-                self._db_path,
-                timeout=10,
-                check_same_thread=False,
-            )
-            self.conn.row_factory = sqlite3.Row
-            self.conn.execute("PRAGMA journal_mode=WAL")
+            conn = self._connect()
+            conn.executescript(_SQL_SCHEMA)
         except sqlite3.DatabaseError:
-            # File exists but is corrupted
+            if conn is not None:
+                with contextlib.suppress(sqlite3.Error):
+                    conn.close()
             self._remove_db_files()
-            self.conn = sqlite3.connect(
-                self._db_path,
-                timeout=10,
-                check_same_thread=False,
-            )
-            self.conn.row_factory = sqlite3.Row
-            self.conn.execute("PRAGMA journal_mode=WAL")
-
-    def _init_db(self):
-        with self._lock:
-            try:
-                self.conn.executescript("""
-                    CREATE TABLE IF NOT EXISTS savings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp REAL NOT NULL,
-                        session_id TEXT NOT NULL,
-                        command TEXT NOT NULL,
-                        processor TEXT NOT NULL,
-                        original_size INTEGER NOT NULL,
-                        compressed_size INTEGER NOT NULL,
-                        platform TEXT NOT NULL
-                    );
-                    CREATE TABLE IF NOT EXISTS sessions (
-                        session_id TEXT PRIMARY KEY,
-                        first_seen REAL NOT NULL,
-                        last_seen REAL NOT NULL,
-                        total_original INTEGER DEFAULT 0,
-                        total_compressed INTEGER DEFAULT 0,
-                        command_count INTEGER DEFAULT 0
-                    );
-                    CREATE TABLE IF NOT EXISTS mismatches (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp REAL NOT NULL,
-                        session_id TEXT NOT NULL,
-                        command TEXT NOT NULL,
-                        processor TEXT NOT NULL,
-                        original_size INTEGER NOT NULL,
-                        platform TEXT NOT NULL
-                    );
-                    CREATE INDEX IF NOT EXISTS idx_savings_session ON savings(session_id);
-                    CREATE INDEX IF NOT EXISTS idx_savings_timestamp ON savings(timestamp);
-                    CREATE INDEX IF NOT EXISTS idx_mismatches_ts ON mismatches(timestamp);
-                """)
-            except sqlite3.DatabaseError:
-                # Corrupted DB — recreate (drop WAL/SHM sidecars too)
-                self.conn.close()
-                self._remove_db_files()
-                self.conn = sqlite3.connect(self._db_path, timeout=10, check_same_thread=False)
-                self.conn.row_factory = sqlite3.Row
-                self.conn.executescript("""
-                    CREATE TABLE savings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp REAL NOT NULL,
-                        session_id TEXT NOT NULL,
-                        command TEXT NOT NULL,
-                        processor TEXT NOT NULL,
-                        original_size INTEGER NOT NULL,
-                        compressed_size INTEGER NOT NULL,
-                        platform TEXT NOT NULL
-                    );
-                    CREATE TABLE sessions (
-                        session_id TEXT PRIMARY KEY,
-                        first_seen REAL NOT NULL,
-                        last_seen REAL NOT NULL,
-                        total_original INTEGER DEFAULT 0,
-                        total_compressed INTEGER DEFAULT 0,
-                        command_count INTEGER DEFAULT 0
-                    );
-                    CREATE TABLE mismatches (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp REAL NOT NULL,
-                        session_id TEXT NOT NULL,
-                        command TEXT NOT NULL,
-                        processor TEXT NOT NULL,
-                        original_size INTEGER NOT NULL,
-                        platform TEXT NOT NULL
-                    );
-                """)
+            conn = self._connect()
+            conn.executescript(_SQL_SCHEMA)
+        self.conn = conn
 
     def _maybe_prune(self):
-        """Prune old records if the DB has grown."""
+        """Prune old records if the DB has grown.
+
+        Each table is probed with a ``MIN()`` first so the common case (nothing
+        older than the cutoff) issues no write and no commit.
+        """
         try:
             with self._lock:
                 cutoff = time.time() - (self.prune_days * 86400)
-                self.conn.execute("DELETE FROM savings WHERE timestamp < ?", (cutoff,))
-                self.conn.execute("DELETE FROM sessions WHERE last_seen < ?", (cutoff,))
-                self.conn.execute("DELETE FROM mismatches WHERE timestamp < ?", (cutoff,))
-                self.conn.commit()
+                pruned = False
+                for probe, delete in _SQL_PRUNE:
+                    oldest = self.conn.execute(probe).fetchone()[0]
+                    if oldest is not None and oldest < cutoff:
+                        self.conn.execute(delete, (cutoff,))
+                        pruned = True
+                if pruned:
+                    self.conn.commit()
         except sqlite3.Error:
             pass
 
     def record_saving(
         self, command: str, processor: str, original_size: int, compressed_size: int, platform: str
     ):
-        """Record a single compression event."""
+        """Record a single compression event (buffered; see ``_flush``)."""
         now = time.time()
+        row = (
+            now,
+            self.session_id,
+            command[:500],
+            processor,
+            original_size,
+            compressed_size,
+            platform,
+        )
         with self._lock:
+            pending = self._pending.setdefault(self._db_path, [])
+            pending.append(row)
+            if len(pending) >= self.FLUSH_BATCH or now - pending[0][0] >= self.FLUSH_INTERVAL:
+                self._flush()
+
+    def _flush(self) -> None:
+        """Write buffered savings rows and their session totals in one transaction.
+
+        Rows stay queued until the commit succeeds, so a failed write (e.g. a
+        locked database) is retried by the next flush instead of dropped.
+        """
+        with self._lock:
+            pending = self._pending.get(self._db_path)
+            if not pending:
+                return
+            # Aggregate per session: first_seen, last_seen, original, compressed, count
+            sessions: dict[str, list] = {}
+            for now, session_id, _cmd, _proc, original_size, compressed_size, _plat in pending:
+                agg = sessions.get(session_id)
+                if agg is None:
+                    sessions[session_id] = [now, now, original_size, compressed_size, 1]
+                else:
+                    agg[1] = now
+                    agg[2] += original_size
+                    agg[3] += compressed_size
+                    agg[4] += 1
             try:
-                self.conn.execute(
-                    "INSERT INTO savings (timestamp, session_id, command, processor, "
-                    "original_size, compressed_size, platform) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        now,
-                        self.session_id,
-                        command[:500],
-                        processor,
-                        original_size,
-                        compressed_size,
-                        platform,
-                    ),
-                )
-                self.conn.execute(
-                    """
-                    INSERT INTO sessions (session_id, first_seen, last_seen,
-                                          total_original, total_compressed, command_count)
-                    VALUES (?, ?, ?, ?, ?, 1)
-                    ON CONFLICT(session_id) DO UPDATE SET
-                        last_seen = ?,
-                        total_original = total_original + ?,
-                        total_compressed = total_compressed + ?,
-                        command_count = command_count + 1
-                """,
-                    (
-                        self.session_id,
-                        now,
-                        now,
-                        original_size,
-                        compressed_size,
-                        now,
-                        original_size,
-                        compressed_size,
-                    ),
+                self.conn.executemany(_SQL_INSERT_SAVING, pending)
+                self.conn.executemany(
+                    _SQL_UPSERT_SESSION, [(sid, *agg) for sid, agg in sessions.items()]
                 )
                 self.conn.commit()
             except sqlite3.Error:
                 with contextlib.suppress(sqlite3.Error):
                     self.conn.rollback()
+                return
+            del self._pending[self._db_path]
 
     def record_mismatch(
         self, command: str, processor: str, original_size: int, platform: str
@@ -233,8 +303,7 @@ class SavingsTracker:
         with self._lock:
             try:
                 self.conn.execute(
-                    "INSERT INTO mismatches (timestamp, session_id, command, processor, "
-                    "original_size, platform) VALUES (?, ?, ?, ?, ?, ?)",
+                    _SQL_INSERT_MISMATCH,
                     (now, self.session_id, command[:500], processor, original_size, platform),
                 )
                 self.conn.commit()
@@ -246,18 +315,7 @@ class SavingsTracker:
         """Return processors that most often ran without compressing enough."""
         with self._lock:
             try:
-                rows = self.conn.execute(
-                    """
-                    SELECT processor,
-                           COUNT(*) as count,
-                           SUM(original_size) as total_original
-                    FROM mismatches
-                    GROUP BY processor
-                    ORDER BY count DESC
-                    LIMIT ?
-                """,
-                    (limit,),
-                ).fetchall()
+                rows = self.conn.execute(_SQL_TOP_MISMATCHES, (limit,)).fetchall()
             except sqlite3.Error:
                 return []
         return [
@@ -273,9 +331,8 @@ class SavingsTracker:
         """Get stats for a session."""
         sid = session_id or self.session_id
         with self._lock:
-            row = self.conn.execute(
-                "SELECT * FROM sessions WHERE session_id = ?", (sid,)
-            ).fetchone()
+            self._flush()
+            row = self.conn.execute(_SQL_SESSION_STATS, (sid,)).fetchone()
         if not row:
             return {"commands": 0, "original": 0, "compressed": 0, "saved": 0, "ratio": 0.0}
         original = row["total_original"]
@@ -293,14 +350,8 @@ class SavingsTracker:
     def get_lifetime_stats(self) -> dict:
         """Get aggregated stats across all sessions."""
         with self._lock:
-            row = self.conn.execute("""
-                SELECT
-                    COUNT(*) as session_count,
-                    COALESCE(SUM(total_original), 0) as total_original,
-                    COALESCE(SUM(total_compressed), 0) as total_compressed,
-                    COALESCE(SUM(command_count), 0) as total_commands
-                FROM sessions
-            """).fetchone()
+            self._flush()
+            row = self.conn.execute(_SQL_LIFETIME_STATS).fetchone()
         original = row["total_original"]
         compressed = row["total_compressed"]
         saved = original - compressed
@@ -317,20 +368,8 @@ class SavingsTracker:
     def get_top_commands(self, limit: int = 10) -> list[dict]:
         """Get commands with the most token savings."""
         with self._lock:
-            rows = self.conn.execute(
-                """
-                SELECT command,
-                       COUNT(*) as count,
-                       SUM(original_size) as total_original,
-                       SUM(compressed_size) as total_compressed,
-                       SUM(original_size - compressed_size) as total_saved
-                FROM savings
-                GROUP BY command
-                ORDER BY total_saved DESC
-                LIMIT ?
-            """,
-                (limit,),
-            ).fetchall()
+            self._flush()
+            rows = self.conn.execute(_SQL_TOP_COMMANDS, (limit,)).fetchall()
         results = []
         for r in rows:
             orig = r["total_original"]
@@ -350,18 +389,8 @@ class SavingsTracker:
     def get_top_processors(self, limit: int = 5) -> list[dict]:
         """Get the most effective processors."""
         with self._lock:
-            rows = self.conn.execute(
-                """
-                SELECT processor,
-                       COUNT(*) as count,
-                       SUM(original_size - compressed_size) as total_saved
-                FROM savings
-                GROUP BY processor
-                ORDER BY total_saved DESC
-                LIMIT ?
-            """,
-                (limit,),
-            ).fetchall()
+            self._flush()
+            rows = self.conn.execute(_SQL_TOP_PROC, (limit,)).fetchall()
         return [
             {"processor": r["processor"], "count": r["count"], "saved": r["total_saved"]}
             for r in rows
@@ -410,5 +439,7 @@ class SavingsTracker:
         return " | ".join(parts)
 
     def close(self):
+        atexit.unregister(self.close)
         with self._lock, contextlib.suppress(sqlite3.Error):
+            self._flush()
             self.conn.close()
@@ -220,6 +220,13 @@ class TestProcessorRegistry:
         priorities = [p.priority for p in processors]
         assert priorities == sorted(priorities)
 
+    def test_discover_processors_memoized(self):
+        """Repeated discovery reuses instances but returns a fresh list."""
+        first = discover_processors()
+        second = discover_processors()
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second, strict=True))
+
     def test_generic_processor_is_last(self):
         """GenericProcessor (priority 999) must always be the last processor."""
         processors = discover_processors()
@@ -453,6 +460,68 @@ class TestProcessorRegistry:
             matched = any(p.search(cmd) for p in compiled)
             assert matched, f"Command {cmd!r} not matched by any hook pattern"
 
+    def test_collect_hook_patterns_does_not_instantiate(self, monkeypatch):
+        """Hook patterns are read from classes; constructors never run."""
+        from src.processors.cdktf import CdktfProcessor
+
+        def _boom(self):
+            raise AssertionError("constructor should not run")
+
+        monkeypatch.setattr(CdktfProcessor, "__init__", _boom)
+        patterns = collect_hook_patterns()
+        assert any(p.startswith("^cdktf") for p in patterns)
+
+    def test_discover_processor_classes_sorted_by_priority(self):
+        from src.processors import discover_processor_classes
+
+        classes = discover_processor_classes()
+        priorities = [cls.priority for cls in classes]
+        assert priorities == sorted(priorities)
+        assert all(isinstance(cls, type) for cls in classes)
+
+    def test_cached_hook_patterns_match_discovery(self, tmp_path, monkeypatch):
+        """The on-disk pattern cache returns the same patterns as discovery."""
+        monkeypatch.setattr("src.data_dir", lambda: str(tmp_path))
+        assert collect_hook_patterns(use_cache=True) == collect_hook_patterns()
+        assert (tmp_path / "hook_patterns.json").is_file()
+        # Second call is served from the cache
+        assert collect_hook_patterns(use_cache=True) == collect_hook_patterns()
+
+    def test_cached_hook_patterns_rebuilt_on_source_change(self, tmp_path, monkeypatch):
+        """Adding a user processor file invalidates the pattern cache."""
+        import json
+
+        monkeypatch.setattr("src.data_dir", lambda: str(tmp_path))
+        collect_hook_patterns(use_cache=True)
+        cache_file = tmp_path / "hook_patterns.json"
+        cached = json.loads(cache_file.read_text())
+        cached["processors"] = [["fake", ["^only-in-cache\\b"]]]
+        cache_file.write_text(json.dumps(cached))
+        assert collect_hook_patterns(use_cache=True) == ["^only-in-cache\\b"]
+
+        user_dir = tmp_path / "processors"
+        user_dir.mkdir()
+        (user_dir / "_unused.py").write_text("")
+        assert collect_hook_patterns(use_cache=True) == collect_hook_patterns()
+
+    def test_cached_hook_patterns_respect_disabled(self, tmp_path, monkeypatch):
+        """Disabled processors are filtered after reading the cache."""
+        import re
+
+        monkeypatch.setattr("src.data_dir", lambda: str(tmp_path))
+        collect_hook_patterns(use_cache=True)
+        monkeypatch.setenv("TOKEN_SAVER_DISABLED_PROCESSORS", "git")
+        from src import config
+
+        try:
+            config.reload()
+            compiled = [re.compile(p) for p in collect_hook_patterns(use_cache=True)]
+            assert not any(p.search("git status") for p in compiled)
+            assert any(p.search("pytest tests/") for p in compiled)
+        finally:
+            monkeypatch.delenv("TOKEN_SAVER_DISABLED_PROCESSORS")
+            config.reload()
+
     def test_engine_uses_discovered_processors(self):
         """CompressionEngine should use auto-discovered processors."""
         engine = CompressionEngine()
@@ -462,6 +531,50 @@ class TestProcessorRegistry:
             assert ep.name == dp.name
             assert ep.priority == dp.priority
 
+    def test_handle_pattern_compiled_per_class(self):
+        """handle_pattern is compiled once and backs the default can_handle."""
+        from src.processors.base import Processor
+        from src.processors.search import SearchProcessor
+
+        assert "can_handle" not in SearchProcessor.__dict__
+        assert SearchProcessor._handle_re.pattern == SearchProcessor.handle_pattern
+        assert SearchProcessor().can_handle("/usr/bin/rg TODO src/")
+        assert not SearchProcessor().can_handle("git grep TODO")
+        assert not Processor._handle_re.search("anything")
+
+    def test_processor_name_falls_back_to_constructor(self):
+        """A name property that needs instance state still resolves."""
+        from src.processors import _processor_name
+
+        class StatefulName:
+            def __init__(self):
+                self._names = {"kind": "stateful"}
+
+            @property
+            def name(self) -> str:
+                return self.__dict__.get("_names", {})["kind"]
+
+        assert _processor_name(StatefulName) == "stateful"
+
+    def test_handle_keywords_do_not_narrow_can_handle(self):
+        """The keyword prefilter only rejects commands the pattern rejects too."""
+        from src.processors.package_list import PackageListProcessor
+        from src.processors.search import SearchProcessor
+        from src.processors.terraform import TerraformProcessor
+
+        commands = [
+            "python3 -m pip list",
+            "pnpm list --depth 0",
+            "cd infra && terraform plan",
+            "tofu state list",
+            "ls -la",
+            "git status",
+        ]
+        for cls in (PackageListProcessor, TerraformProcessor, SearchProcessor):
+            p = cls()
+            for command in commands:
+                assert p.can_handle(command) == bool(cls._handle_re.search(command))
+
 
 class TestRouting:
     """Regression tests for first-match processor selection."""
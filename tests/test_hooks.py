@@ -332,6 +332,23 @@ class TestHookPretool:
         assert is_compressible("http GET https://api.example.com")
         assert is_compressible("https POST https://api.example.com")
 
+    def test_combined_patterns_empty_list_matches_nothing(self):
+        from scripts.hook_pretool import _compile_any, _search_any
+
+        combined = _compile_any([])
+        assert not _search_any(combined, [], "git status")
+
+    def test_combined_patterns_fall_back_on_global_inline_flag(self):
+        from scripts.hook_pretool import _compile_any, _search_any
+
+        patterns = [r"^git\b", r"(?i)^mytool\b"]
+        combined = _compile_any(patterns)
+        assert combined is None
+        assert _search_any(combined, patterns, "MYTOOL run")
+        assert not _search_any(combined, patterns, "ls -la")
+        # The inline flag must not leak into the other patterns
+        assert not _search_any(combined, patterns, "GIT STATUS")
+
 
 class TestHookPretoolIntegration:
     """Test the full hook script behavior via subprocess."""
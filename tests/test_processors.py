@@ -1571,6 +1571,39 @@ class TestNetworkProcessor:
         # Response body kept
         assert '"data": "value"' in result
 
+    def test_curl_verbose_strips_progress_keeps_errors(self):
+        output = "\n".join(
+            [
+                "  % Total    % Received % Xferd  Average Speed   Time    Time     Time  Current",
+                "  0     0    0     0    0     0      0      0 --:--:-- --:--:-- --:--:--     0",
+                "* Host example.com:443 was resolved.",
+                "* Failed to connect to example.com port 443: Connection refused",
+                "> GET / HTTP/1.1",
+            ]
+        )
+        result = self.p.process("curl -v https://example.com", output)
+        assert "% Total" not in result
+        assert "--:--:--" not in result
+        assert "was resolved" not in result
+        assert "Connection refused" in result
+        assert "GET / HTTP/1.1" in result
+
+    def test_curl_verbose_strips_certificate_details(self):
+        output = "\n".join(
+            [
+                "* Server certificate:",
+                "*  subject: CN=example.com",
+                "*  start date: Jan  1 00:00:00 2025 GMT",
+                "*  expire date: Apr  1 23:59:59 2025 GMT",
+                "*  issuer: C=US; O=Let's Encrypt; CN=R3",
+                "*  SSL certificate verify ok.",
+                "* Closing connection 0",
+                "< HTTP/1.1 404 Not Found",
+            ]
+        )
+        result = self.p.process("curl -v https://example.com/missing", output)
+        assert result == "< HTTP/1.1 404 Not Found"
+
     def test_curl_progress_stripped(self):
         output = "\n".join(
             [
@@ -1937,6 +1970,17 @@ class TestPackageListProcessor:
         assert "Top-level" in result
         assert len(result.splitlines()) < len(lines)
 
+    def test_npm_ls_ascii_tree_counts(self):
+        lines = ["my-project@1.0.0 /home/user/project"]
+        for i in range(8):
+            lines.append(f"+-- package-{i}@{i}.0.0")
+            for j in range(3):
+                lines.append(f"| `-- sub-dep-{i}-{j}@0.{j}.0")
+        output = "\n".join(lines)
+        result = self.p.process("npm ls", output)
+        assert "32 total dependencies:" in result
+        assert "sub-dep-0-0" not in result
+
     def test_npm_ls_shows_issues(self):
         lines = [
             "my-project@1.0.0",
@@ -3266,6 +3310,17 @@ class TestSearchExtensionless:
         assert "bin/mycommand" in result
         assert "25 matches" in result
 
+    def test_match_file_path_forms(self):
+        from src.processors.search import _match_file_path
+
+        assert _match_file_path("src/app.py:12:def main():") == "src/app.py"
+        assert _match_file_path("src/app.py:import os") == "src/app.py"
+        assert _match_file_path("Makefile:3:all: build") == "Makefile"
+        assert _match_file_path(r"C:\repo\app.py:7:x = 1") == r"C:\repo\app.py"
+        assert _match_file_path("Makefile:all: build") is None
+        assert _match_file_path("my file.py:1:x") is None
+        assert _match_file_path("no colon here") is None
+
 
 class TestCloudCliImportantKeys:
     """Test that cloud CLI preserves keys like InstanceId via .search()."""
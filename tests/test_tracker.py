@@ -2,6 +2,7 @@
 
 import json
 import os
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -9,6 +10,7 @@ import threading
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src import tracker as tracker_module
 from src.tracker import SavingsTracker
 
 
@@ -120,6 +122,38 @@ class TestSavingsTracker:
         assert len(top) == 2
         assert top[0]["processor"] == "git"  # More saved
 
+    def test_connection_pragmas(self):
+        conn = self.tracker.conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_top_processors_uses_covering_index(self):
+        plan = self.tracker.conn.execute(
+            "EXPLAIN QUERY PLAN " + tracker_module._SQL_TOP_PROC, (5,)
+        ).fetchall()
+        assert any("COVERING INDEX idx_savings_proc_sizes" in row["detail"] for row in plan)
+
+    def test_prune_removes_only_stale_rows(self):
+        self.tracker.record_saving("git status", "git", 1000, 200, "claude_code")
+        self.tracker._flush()
+        self.tracker.conn.execute(
+            "INSERT INTO savings (timestamp, session_id, command, processor, "
+            "original_size, compressed_size, platform) VALUES (0, 'old', 'ls', 'ls', 10, 5, 'x')"
+        )
+        self.tracker.conn.commit()
+        self.tracker._maybe_prune()
+        rows = self.tracker.conn.execute("SELECT session_id FROM savings").fetchall()
+        assert [r[0] for r in rows] == ["test-session"]
+
+    def test_prune_without_stale_rows_does_not_write(self):
+        self.tracker.record_saving("git status", "git", 1000, 200, "claude_code")
+        self.tracker._flush()
+        before = self.tracker.conn.total_changes
+        self.tracker._maybe_prune()
+        assert self.tracker.conn.total_changes == before
+        assert not self.tracker.conn.in_transaction
+
     def test_record_and_retrieve_mismatches(self):
         self.tracker.record_mismatch("docker ps", "docker", 1000, "claude_code")
         self.tracker.record_mismatch("docker ps", "docker", 1200, "claude_code")
@@ -184,6 +218,66 @@ class TestSavingsTracker:
         stats = self.tracker.get_session_stats()
         assert stats["commands"] == 80
 
+    def test_record_saving_is_batched(self):
+        """Rows are buffered until a read, close(), or a full batch flushes them."""
+
+        def stored_rows():
+            conn = sqlite3.connect(SavingsTracker.DB_PATH)
+            try:
+                return conn.execute("SELECT COUNT(*) FROM savings").fetchone()[0]
+            finally:
+                conn.close()
+
+        for i in range(3):
+            self.tracker.record_saving(f"cmd {i}", "test", 100, 50, "claude_code")
+        assert stored_rows() == 0
+
+        # Another tracker on the same DB flushes the shared buffer before reading
+        other = SavingsTracker(session_id="other-session")
+        assert other.get_session_stats("test-session")["commands"] == 3
+        other.close()
+        assert stored_rows() == 3
+
+        for i in range(SavingsTracker.FLUSH_BATCH):
+            self.tracker.record_saving(f"batch {i}", "test", 100, 50, "claude_code")
+        assert stored_rows() == 3 + SavingsTracker.FLUSH_BATCH
+
+    def test_failed_flush_keeps_pending_rows(self):
+        """A write error during a flush leaves the rows queued for the next one."""
+
+        class LockedConnection:
+            def __init__(self, conn):
+                self._conn = conn
+
+            def executemany(self, *_args):
+                raise sqlite3.OperationalError("database is locked")
+
+            def __getattr__(self, name):
+                return getattr(self._conn, name)
+
+        real_conn = self.tracker.conn
+        self.tracker.record_saving("git status", "git", 1000, 200, "claude_code")
+        self.tracker.conn = LockedConnection(real_conn)
+        try:
+            self.tracker._flush()
+        finally:
+            self.tracker.conn = real_conn
+        assert real_conn.execute("SELECT COUNT(*) FROM savings").fetchone()[0] == 0
+
+        self.tracker.record_saving("git diff", "git", 500, 100, "claude_code")
+        stats = self.tracker.get_session_stats()
+        assert stats["commands"] == 2
+        assert stats["original"] == 1500
+
+    def test_trackers_on_same_session_are_independent(self):
+        """Closing one tracker leaves another on the same session usable."""
+        other = SavingsTracker(session_id="test-session", prune_days=30)
+        assert other is not self.tracker
+        assert other.prune_days == 30
+        other.close()
+        self.tracker.record_saving("git status", "git", 100, 50, "claude_code")
+        assert self.tracker.get_session_stats()["commands"] == 1
+
     def test_session_id_from_env(self):
         """TOKEN_SAVER_SESSION env var should set the session ID."""
         os.environ["TOKEN_SAVER_SESSION"] = "env-session-42"  # noqa: S105